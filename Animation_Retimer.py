@@ -13,23 +13,71 @@ bl_info = {
 }
 
 import bpy
-from collections import defaultdict
-import copy  # Import deep copy module
+import numpy as np
 import time # For performance timing (optional)
+try:
+    from numba import njit # Optional: JIT-compiled remap kernel when numba is installed
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# Enum value of 'BEZIER' in Keyframe.interpolation (Blender's BEZT_IPO_BEZ)
+BEZIER_INTERPOLATION = 2
 
 # --- Data Storage ---
-# Store original marker positions (scene-wide)
-retimer_data = {
-    "original_markers": {},
-    "original_start": 0,
-    "original_end": 0,
-    "original_segments": [],
-    # Store data per object
-    "objects_processed": [], # Keep track of which objects we started retiming
-    "objects_temp_keyframe_data": {}, # {obj_name: {fcurve_key: [(x, y, interp, hl, hr, type), ...], ...}} # Added type
-}
+class _RetimerState:
+    """Module-wide retiming state. Slots instead of a dict: the panel reads these on every redraw."""
+    __slots__ = (
+        "original_markers", "original_start", "original_end", "original_segments",
+        "objects_processed", "objects_temp_keyframe_data",
+        "sorted_names", "orig_frames", "orig_has_ties", "orig_starts", "orig_ends", "orig_lengths", "orig_seg_prepared",
+        "seg_ui_cache",
+    )
+
+    def __init__(self):
+        self.clear()
+
+    def end_session(self):
+        """Drop everything captured when retiming started (on Apply/Cancel)"""
+        # Store original marker positions (scene-wide)
+        self.original_markers = {} # {name: frame}
+        self.original_start = 0
+        self.original_end = 0
+        self.original_segments = () # ((start, end), ...) as ints
+        # Store data per object
+        self.objects_processed = [] # Keep track of which objects we started retiming
+        self.objects_temp_keyframe_data = {} # {obj_name: {fcurve_key: {"co", "hl", "hr", "interp", "type"}, ...}} # SoA numpy arrays per F-Curve
+        # Original layout preprocessed once at start: names sorted by frame and the matching segment arrays
+        self.sorted_names = ()
+        self.orig_frames = self.orig_starts = self.orig_ends = self.orig_lengths = None
+        self.orig_has_ties = False # Some markers started on the same frame, see order_tied_markers
+        self.orig_seg_prepared = () # Panel status: (start, end, 1/length or 0.0) per segment
+        self.seg_ui_cache = None # Panel status rows, see ANIMATION_RETIMER_PT_Panel.draw
+
+    def clear(self):
+        self.end_session()
+
+# Store original marker positions and per-object snapshots
+retimer_data = _RetimerState()
+
+# Panel segment status: icon per sign(ratio - 1) (slower, unchanged, faster) and the row text
+_SPEED_ICON = {-1: 'TRIA_UP', 0: 'RIGHTARROW', 1: 'TRIA_DOWN'}
+_SEG_FMT = "Seg {i} [{os}-{oe} -> {cs}-{ce}]: {txt}"
 
 # --- Utility Functions ---
+def redraw_marker_views(context):
+    """Tag every area for a single redraw after a marker edit, markers show up in the timeline,
+    dope sheet, graph editor and this panel alike. The panel's segment rows are key-checked on the next draw."""
+    screen = context.screen
+    if screen:
+        for area in screen.areas: area.tag_redraw()
+
+def rt_marker_count(scene):
+    """Number of 'RT_' markers, a single name scan without building or sorting a list"""
+    if not scene or not scene.timeline_markers:
+        return 0
+    return sum(1 for m in scene.timeline_markers if m.name.startswith("RT_"))
+
 def get_ordered_markers(scene):
     """Return markers sorted by frame number"""
     # Ensure markers exist before trying to access them
@@ -40,35 +88,227 @@ def get_ordered_markers(scene):
         key=lambda m: m.frame
     )
 
-def find_segment(frame, segments):
-    """Find which segment a frame belongs to. Returns index, 'before', 'after', or None."""
-    if not segments: # Handle case with no segments defined
-        return None
-
-    for i, (start, end) in enumerate(segments):
-        # Allow frame to be exactly on the start or end marker
-        # Use a small tolerance for floating point comparisons? Maybe not needed for frame numbers.
-        if start <= frame <= end:
-            # Special case: if frame is exactly on the end marker of a segment,
-            # and it's NOT the end marker of the *last* segment, associate it with the *next* segment's start.
-            # This helps handle scaling at the marker points more intuitively.
-            # Let's reconsider: Associate with the segment it falls within.
-            # If frame == end, it belongs to segment i. If frame == start of next, it belongs to next.
-             if frame == end and i < len(segments) - 1 and frame == segments[i+1][0]:
-                  # If exactly on the boundary between two segments, associate with the *first* one (i)
-                  return i
-             elif start <= frame <= end:
-                  return i
-
-
-    # Check if frame is before the first marker or after the last marker
-    if frame < segments[0][0]:
-        return 'before'
-    elif frame > segments[-1][1]:
-        return 'after'
-
-    # Should theoretically not be reached if segments cover the range, but acts as fallback
-    return None
+def get_marker_fingerprint(scene):
+    """Cheap snapshot of all 'RT_' marker names and frames, used to detect marker changes without sorting.
+    Compared as a tuple rather than hashed: hash(-1) == hash(-2), so frame moves could go unnoticed."""
+    return tuple((m.name, m.frame) for m in scene.timeline_markers if m.name.startswith("RT_"))
+
+def order_tied_markers(orig_frames, curr_frames):
+    """Permutation for markers that share an original frame: within each such group they are
+    ordered by current frame, so a marker dragged out of the group takes the segment on its side.
+    orig_frames must already be sorted, other markers keep their place (lexsort is stable)."""
+    return np.lexsort((curr_frames, orig_frames))
+
+def prepare_segment_tables(orig_lengths, curr_starts, curr_ends):
+    """Per-segment tables remap_frames needs, which only depend on the markers:
+    (zero_length mask, lengths safe to divide by, current lengths).
+    Build them once per update and pass them to every remap_frames call."""
+    zero_length = np.abs(orig_lengths) < 0.0001
+    # Avoid dividing by zero, zero-length segments are handled by the mask in remap_frames.
+    # Kept as a division (no reciprocal) so keys on a marker stay exact.
+    safe_lengths = np.where(zero_length, 1.0, orig_lengths)
+    return zero_length, safe_lengths, curr_ends - curr_starts
+
+def remap_frames(x, orig_starts, orig_ends, curr_starts, curr_ends, orig_lengths=None, out=None, tables=None):
+    """Map original frame positions to retimed ones for a whole array at once.
+    Keys inside a segment are scaled with it, keys before the first / after the last
+    marker are offset with that marker. Segment arrays must be sorted by original start.
+    orig_lengths (orig_ends - orig_starts) can be passed in when it is already known,
+    out is an optional float64 array of len(x) to write the result into,
+    tables is the result of prepare_segment_tables when it is already known."""
+    # Binary search for the segment of each key. side='left' keeps a key sitting exactly
+    # on a shared marker in the earlier segment.
+    idx = np.searchsorted(orig_starts, x, side='left') - 1
+    np.clip(idx, 0, len(orig_starts) - 1, out=idx)
+
+    seg_orig_start = orig_starts[idx]
+    seg_curr_start = curr_starts[idx]
+    if tables is None:
+        if orig_lengths is None:
+            orig_lengths = orig_ends - orig_starts
+        tables = prepare_segment_tables(orig_lengths, curr_starts, curr_ends)
+    zero_length, safe_lengths, curr_lengths = tables
+
+    # Normalize first so keys on a marker land exactly on its new frame.
+    # Computed in place in the output buffer to keep temporaries down.
+    new_x = np.subtract(x, seg_orig_start, out=out)
+    new_x /= safe_lengths[idx]
+    new_x *= curr_lengths[idx]
+    new_x += seg_curr_start
+    np.copyto(new_x, seg_curr_start, where=zero_length[idx]) # Snap keys in zero-length segments to start
+    np.add(x, curr_starts[0] - orig_starts[0], out=new_x, where=x < orig_starts[0])
+    np.add(x, curr_ends[-1] - orig_ends[-1], out=new_x, where=x > orig_ends[-1])
+    return new_x
+
+def remap_frames_uniform(x, orig_start, orig_end, curr_start, curr_end, out=None):
+    """remap_frames for the special case where every segment scales by the same ratio:
+    the whole marker range is one segment, so there is no per-key segment lookup."""
+    new_x = np.subtract(x, orig_start, out=out)
+    new_x /= orig_end - orig_start
+    new_x *= curr_end - curr_start
+    new_x += curr_start
+    np.add(x, curr_start - orig_start, out=new_x, where=x < orig_start)
+    np.add(x, curr_end - orig_end, out=new_x, where=x > orig_end)
+    return new_x
+
+if HAVE_NUMBA:
+    # No on-disk cache: it is tied to the module name, which differs between add-on installs
+    @njit
+    def remap_frames_numba(x, orig_starts, orig_ends, curr_starts, curr_ends, out):
+        """Same mapping as remap_frames, as a single compiled loop writing into out.
+        No fastmath: the arithmetic order must match so keys on markers stay exact."""
+        num_segments = orig_starts.size
+        before_offset = curr_starts[0] - orig_starts[0]
+        after_offset = curr_ends[-1] - orig_ends[-1]
+        for k in range(x.size):
+            xk = x[k]
+            if xk < orig_starts[0]:
+                out[k] = xk + before_offset
+                continue
+            if xk > orig_ends[-1]:
+                out[k] = xk + after_offset
+                continue
+            # Manual searchsorted(side='left'): first start >= xk, the segment is the one before it
+            lo, hi = 0, num_segments
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if orig_starts[mid] < xk:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            i = min(max(lo - 1, 0), num_segments - 1)
+            orig_length = orig_ends[i] - orig_starts[i]
+            if abs(orig_length) < 0.0001:
+                out[k] = curr_starts[i] # Snap keys in zero-length segments to start
+            else:
+                out[k] = (xk - orig_starts[i]) / orig_length * (curr_ends[i] - curr_starts[i]) + curr_starts[i]
+        return out
+
+def snapshot_fcurve(fcurve):
+    """Read all keyframes of an F-Curve into numpy arrays (one foreach_get per property).
+    Returns the stored snapshot dict used by the modal operator, restore and Cancel."""
+    points = fcurve.keyframe_points
+    n = len(points)
+    # Read everything in one shot per property, Blender fills the buffers directly
+    # Stored as parallel arrays (SoA): one row per key, columns are x/y
+    co = np.empty((n, 2), dtype=np.single)
+    hl = np.empty((n, 2), dtype=np.single)
+    hr = np.empty((n, 2), dtype=np.single)
+    interp = np.empty(n, dtype=np.int32)
+    k_type = np.empty(n, dtype=np.int32)
+    points.foreach_get("co", co.ravel())
+    points.foreach_get("handle_left", hl.ravel())
+    points.foreach_get("handle_right", hr.ravel())
+    points.foreach_get("interpolation", interp)
+    points.foreach_get("type", k_type)
+    return {
+        # Enum codes all fit in int8, a quarter of the int32 that foreach_get/foreach_set need
+        "co": co, "hl": hl, "hr": hr, "interp": interp.astype(np.int8), "type": k_type.astype(np.int8),
+        "in_order": True, # Points currently hold the stored keys in their original order
+        # Handles are only evaluated on Bezier segments, curves without any can skip handle writes
+        "needs_handles": bool(np.any(interp == BEZIER_INTERPOLATION)),
+        # Key range, used to skip F-Curves that a marker move doesn't reach
+        "x_min": float(co[:, 0].min()) if n else np.inf,
+        "x_max": float(co[:, 0].max()) if n else -np.inf,
+        # Original X in double precision for the remap (scratch buffers are shared, see allocate_scratch_buffers)
+        "x64": co[:, 0].astype(np.float64),
+    }
+
+def allocate_scratch_buffers(max_n):
+    """Working buffers for the modal tick, allocated once per retiming session for the longest
+    F-Curve and sliced to each curve's key count, so the hot path doesn't allocate per F-Curve
+    and idle curves don't carry their own copies (merging only ever shrinks keys)."""
+    return {
+        "x": np.empty(max_n, dtype=np.float64),
+        "round": np.empty(max_n, dtype=np.float64),
+        "dist": np.empty(max_n, dtype=np.float64),
+        "diff": np.empty(max(max_n - 1, 0), dtype=np.float64),
+        "co": np.empty((max_n, 2), dtype=np.single),
+        "hl": np.empty((max_n, 2), dtype=np.single),
+        "hr": np.empty((max_n, 2), dtype=np.single),
+        "dx": np.empty(max_n, dtype=np.single),
+        "identity": np.arange(max_n), # keep indices when every key survives in order
+    }
+
+def apply_keyframe_arrays(fcurve, co, handle_left, handle_right, interp, k_type, update=True):
+    """Replace all keyframes of an F-Curve with the given arrays.
+    co/handles are (n, 2) float32 arrays, interp/k_type (n,) integer enum codes (widened to int32 here).
+    Pass None for interp and k_type to leave the points' current enums untouched, or None for
+    both handles to leave them as they are (only sensible when the key count is unchanged).
+    With update=False the caller is responsible for calling fcurve.update() afterwards.
+    Raises ReferenceError if surplus keyframes could not be removed."""
+    points = fcurve.keyframe_points
+    count = len(co)
+    current = len(points)
+    # Resize the point list to the new key count, then overwrite every point in place.
+    # Surplus points are removed from the tail so nothing behind them has to be shifted,
+    # unless more would go than stay (e.g. a collapsed segment): then rebuilding is fewer calls.
+    if current - count > count:
+        points.clear()
+        points.add(count)
+    elif current > count:
+        for i in range(current - 1, count - 1, -1):
+            points.remove(points[i], fast=True)
+    elif current < count:
+        points.add(count - current)
+
+    if count:
+        # Bulk write: Blender copies straight from the buffers instead of one RNA access per key
+        # foreach_set wants flat (x0, y0, x1, y1, ...) buffers
+        points.foreach_set("co", co.ravel())
+        if handle_left is not None:
+            points.foreach_set("handle_left", handle_left.ravel())
+        if handle_right is not None:
+            points.foreach_set("handle_right", handle_right.ravel())
+        # Enums are written as int codes in one call each (supported since Blender 2.90)
+        if interp is not None:
+            points.foreach_set("interpolation", interp.astype(np.int32, copy=False))
+        if k_type is not None:
+            points.foreach_set("type", k_type.astype(np.int32, copy=False))
+    if update:
+        fcurve.update()
+
+def restore_object_keyframes(obj):
+    """Restore keyframes for a single object from stored data, including type. Used by Cancel.
+    Returns the number of F-Curves that could not be restored, for the caller to report once."""
+    obj_name = obj.name
+    if not obj or not obj.animation_data or not obj.animation_data.action:
+        # print(f"Cannot restore for {obj_name}: Missing object or animation data.") # Less verbose
+        return 0
+    if obj_name not in retimer_data.objects_temp_keyframe_data:
+         # print(f"Warning: No stored keyframe data found for {obj_name}. Skipping restore.") # Less verbose
+         return 0
+
+    action = obj.animation_data.action
+    stored_fcurve_data = retimer_data.objects_temp_keyframe_data[obj_name]
+    # print(f"Restoring keyframes for: {obj_name}") # Less verbose
+
+    failed = 0
+    touched_fcurves = [] # update() runs once per curve after every write for the object, as in process_retiming
+    for fcurve in action.fcurves:
+        key = (fcurve.data_path, fcurve.array_index)
+        if key not in stored_fcurve_data:
+            continue
+
+        # --- Write the original keyframes back in bulk (points are reused, handles are plain float arrays) ---
+        stored = stored_fcurve_data[key]
+        # While the points still hold the stored keys in order, their enums are already the originals
+        enums_intact = stored["in_order"] and len(fcurve.keyframe_points) == len(stored["co"])
+        try:
+            apply_keyframe_arrays(fcurve, stored["co"], stored["hl"], stored["hr"],
+                                  None if enums_intact else stored["interp"], None if enums_intact else stored["type"],
+                                  update=False)
+            stored["in_order"] = True
+            touched_fcurves.append(fcurve)
+        except ReferenceError: # Possible internal Blender issue, skip this F-Curve
+            failed += 1
+
+    for fcurve in touched_fcurves:
+        try:
+            fcurve.update()
+        except ReferenceError:
+            failed += 1
+    return failed
 
 
 # --- Operators ---
@@ -94,11 +334,10 @@ class ANIMATION_RETIMER_OT_AddMarker(bpy.types.Operator):
              i += 1
 
         marker = context.scene.timeline_markers.new(name=marker_name, frame=frame)
+        redraw_marker_views(context)
         # Store original position immediately IF retiming is not active
         if not context.window_manager.retimer_active:
-             if "original_markers" not in retimer_data:
-                 retimer_data["original_markers"] = {}
-             retimer_data["original_markers"][marker.name] = marker.frame
+             retimer_data.original_markers[marker.name] = marker.frame
         self.report({'INFO'}, f"Added marker: {marker.name}")
         return {'FINISHED'}
 
@@ -110,7 +349,23 @@ class ANIMATION_RETIMER_OT_RetimeMarker(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'} # UNDO applies to starting/stopping
 
     _timer = None
-    _last_marker_positions = {}
+    _timer_interval = 0.1
+    _last_marker_fingerprint = None
+    _last_change_time = 0.0
+    # Adaptive timer: fast while markers are being moved, slow once they sit still
+    _active_interval = 0.1 # Seconds
+    _idle_interval = 0.5 # Seconds
+    _idle_after = 2.0 # Seconds without marker changes before slowing down
+    # Per-session segment cache, rebuilt only when the set of marker names changes
+    _cached_marker_names = None
+    _cached_sorted_names = ()
+    _cached_orig_segments_np = None
+    _cached_orig_frames = None
+    _cached_has_ties = False
+    _cached_curr_segments_np = None
+    _last_curr_frames = None
+    _last_snap_frames = None
+    _scratch = None # allocate_scratch_buffers() result for the running session
 
     def store_initial_keyframe_data_for_object(self, obj):
         """Store complete initial keyframe data for a single object, including type"""
@@ -120,74 +375,19 @@ class ANIMATION_RETIMER_OT_RetimeMarker(bpy.types.Operator):
 
         action = obj.animation_data.action
         obj_name = obj.name
-        if "objects_temp_keyframe_data" not in retimer_data:
-            retimer_data["objects_temp_keyframe_data"] = {}
-        retimer_data["objects_temp_keyframe_data"][obj_name] = {} # Ensure object entry exists
+        retimer_data.objects_temp_keyframe_data[obj_name] = {} # Ensure object entry exists
 
         # print(f"Storing initial keyframes for: {obj_name}") # Less verbose
         count = 0
         for fcurve in action.fcurves:
             key = (fcurve.data_path, fcurve.array_index) # Unique key: (data_path, array_index)
-            # Store x, y, interpolation, handles (deep copied), and type
-            keyframe_data = [
-                (kp.co.x, kp.co.y, kp.interpolation, copy.deepcopy(kp.handle_left), copy.deepcopy(kp.handle_right), kp.type)
-                for kp in fcurve.keyframe_points
-            ]
-            retimer_data["objects_temp_keyframe_data"][obj_name][key] = keyframe_data
-            count += len(keyframe_data)
+            snapshot = snapshot_fcurve(fcurve)
+            retimer_data.objects_temp_keyframe_data[obj_name][key] = snapshot
+            count += len(snapshot["interp"])
 
         # print(f"Stored {count} keyframes across {len(action.fcurves)} F-Curves for {obj_name}.") # Less verbose
         return True # Indicate success
 
-    def restore_from_original_for_object(self, obj):
-        """Restore keyframes for a single object from stored data, including type. Used by Cancel."""
-        obj_name = obj.name
-        if not obj or not obj.animation_data or not obj.animation_data.action:
-            # print(f"Cannot restore for {obj_name}: Missing object or animation data.") # Less verbose
-            return
-        if "objects_temp_keyframe_data" not in retimer_data or \
-           obj_name not in retimer_data["objects_temp_keyframe_data"]:
-             # print(f"Warning: No stored keyframe data found for {obj_name}. Skipping restore.") # Less verbose
-             return
-
-        action = obj.animation_data.action
-        stored_fcurve_data = retimer_data["objects_temp_keyframe_data"][obj_name]
-        # print(f"Restoring keyframes for: {obj_name}") # Less verbose
-
-        for fcurve in action.fcurves:
-            key = (fcurve.data_path, fcurve.array_index)
-            if key not in stored_fcurve_data:
-                continue
-
-            # --- Clear existing keyframes ---
-            try:
-                # Faster way to clear? No direct 'clear' method. Removing one by one is standard.
-                while len(fcurve.keyframe_points) > 0:
-                    fcurve.keyframe_points.remove(fcurve.keyframe_points[0], fast=True)
-            except ReferenceError:
-                print(f"Warning: Could not clear keyframes for {key} in {obj_name} (possible internal Blender issue). Skipping F-Curve.")
-                continue
-
-            # --- Add back original keyframes ---
-            original_keys = stored_fcurve_data[key]
-            if not original_keys:
-                 continue
-
-            # Data should be sorted by x already, but sorting doesn't hurt
-            sorted_keys = sorted(original_keys, key=lambda k: k[0])
-            for x, y, interp, hl, hr, k_type in sorted_keys: # Unpack type
-                try:
-                    kp = fcurve.keyframe_points.insert(x, y, options={'NEEDED', 'FAST'})
-                    kp.interpolation = interp
-                    # Use deepcopy *again* when restoring handles
-                    kp.handle_left = copy.deepcopy(hl)
-                    kp.handle_right = copy.deepcopy(hr)
-                    kp.type = k_type # Restore the keyframe type
-                except Exception as e:
-                    print(f"Error inserting keyframe at {x} for {key} in {obj_name}: {e}")
-
-            fcurve.update()
-
     def process_retiming(self, context):
         """Apply retiming logic to all tracked objects based on marker changes"""
         #perf_start_time = time.time() # Optional: for performance measurement
@@ -196,162 +396,222 @@ class ANIMATION_RETIMER_OT_RetimeMarker(bpy.types.Operator):
         if not scene: return # Scene closed?
 
         # --- 1. Check if Markers Changed ---
-        markers = get_ordered_markers(scene)
-        if len(markers) < 2: return
+        # Fast exit while idle: compare a fingerprint before sorting markers or building dicts
+        marker_fingerprint = get_marker_fingerprint(scene)
+        if marker_fingerprint == self._last_marker_fingerprint: return
+        self._last_marker_fingerprint = marker_fingerprint
+        self._last_change_time = time.time()
 
-        current_positions = {m.name: m.frame for m in markers}
-        if not hasattr(self, '_last_marker_positions'): self._last_marker_positions = {}
-        if current_positions == self._last_marker_positions: return # No change
+        # The fingerprint already holds every (name, frame) pair, so build the positions from it
+        # instead of reading the markers through RNA a second time. Same order as get_ordered_markers.
+        ordered_positions = sorted(marker_fingerprint, key=lambda name_frame: name_frame[1])
+        if len(ordered_positions) < 2: return
 
-        self._last_marker_positions = current_positions.copy()
+        # Only built once the fingerprint says something moved; the idle check is the tuple compare above
+        current_positions = dict(ordered_positions)
 
         # --- 2. Recalculate Segment Mappings ---
-        original_marker_positions = retimer_data.get("original_markers", {})
+        original_marker_positions = retimer_data.original_markers
         if not original_marker_positions: return # Should not happen if started correctly
 
-        valid_current_markers = {name: marker for name, marker in zip(current_positions.keys(), markers) if name in original_marker_positions}
-        if len(valid_current_markers) < 2: return
-
-        sorted_marker_names = sorted(valid_current_markers.keys(), key=lambda name: original_marker_positions[name])
+        # The marker order and original segments only change when markers are added/removed.
+        # While dragging, the same names come back every tick, so reuse them.
+        if current_positions.keys() != self._cached_marker_names:
+            # Names were pre-sorted by original frame at start-up, only filter out missing ones.
+            # The original frames are stored parallel to the names, so the same mask selects them.
+            all_names = retimer_data.sorted_names
+            present = np.fromiter((name in current_positions for name in all_names), dtype=bool, count=len(all_names))
+            sorted_marker_names = tuple(name for name, keep in zip(all_names, present.tolist()) if keep)
+            orig_frames = retimer_data.orig_frames[present]
+            self._cached_marker_names = frozenset(current_positions)
+            self._cached_sorted_names = sorted_marker_names
+            self._cached_orig_segments_np = (orig_frames[:-1], orig_frames[1:], np.diff(orig_frames))
+            self._cached_orig_frames = orig_frames
+            self._cached_has_ties = bool(np.any(self._cached_orig_segments_np[2] == 0))
+            self._last_curr_frames = None # Segment layout changed, every F-Curve needs an update
+
+        sorted_marker_names = self._cached_sorted_names
+        if len(sorted_marker_names) < 2: return
+
+        # Only the current frames need to be gathered every tick
+        curr_frames = np.fromiter((current_positions[name] for name in sorted_marker_names), dtype=np.float64, count=len(sorted_marker_names))
+        if self._cached_has_ties:
+            # Markers that started on the same frame follow where they are now, not their creation order
+            curr_frames = curr_frames[order_tied_markers(self._cached_orig_frames, curr_frames)]
+        self._cached_curr_segments_np = (curr_frames[:-1], curr_frames[1:])
+
+        # Segment boundary arrays, shared by every F-Curve
+        orig_starts, orig_ends, orig_lengths = self._cached_orig_segments_np
+        curr_starts, curr_ends = self._cached_curr_segments_np
+
+        # Special case: all segments scaled by the same ratio (e.g. a single segment, or the whole
+        # range stretched evenly). Checked exactly on whole-frame lengths, zero-length segments excluded.
+        orig_total = orig_ends[-1] - orig_starts[0]
+        curr_total = curr_ends[-1] - curr_starts[0]
+        uniform_scale = bool(np.all(np.abs(orig_lengths) >= 0.0001)) and \
+                        np.array_equal((curr_ends - curr_starts) * orig_total, orig_lengths * curr_total)
+
+        # Segment tables for the numpy remap path, shared by every F-Curve this tick
+        segment_tables = None if uniform_scale or HAVE_NUMBA else prepare_segment_tables(orig_lengths, curr_starts, curr_ends)
 
-        original_segments = []
-        current_segments = []
-        for i in range(len(sorted_marker_names) - 1):
-            name1, name2 = sorted_marker_names[i], sorted_marker_names[i+1]
-            if name1 not in current_positions or name2 not in current_positions: continue
-
-            orig_start = original_marker_positions[name1]
-            orig_end = original_marker_positions[name2]
-            curr_start = current_positions[name1]
-            curr_end = current_positions[name2]
+        snap_frames = wm.retimer_snap_frames # Cache property lookup
 
-            original_segments.append((orig_start, orig_end))
-            current_segments.append((curr_start, curr_end))
+        # Work out which range of original frames is affected by the markers that moved since the
+        # last update: the segments on both sides of a moved marker, up to infinity for the first/last
+        # marker since everything before/after it is offset. F-Curves outside that range stay as they are.
+        affected_start, affected_end = -np.inf, np.inf
+        if self._last_curr_frames is not None and snap_frames == self._last_snap_frames:
+            changed = np.flatnonzero(curr_frames != self._last_curr_frames)
+            if len(changed) == 0: return # Only markers that don't take part in retiming moved
+            first, last = changed[0], changed[-1]
+            if first > 0: affected_start = orig_starts[first - 1]
+            if last < len(sorted_marker_names) - 1: affected_end = orig_ends[last]
+        self._last_curr_frames = curr_frames
+        self._last_snap_frames = snap_frames
 
         # --- 3. Process Each Object ---
-        objects_to_retime = retimer_data.get("objects_processed", [])
+        objects_to_retime = retimer_data.objects_processed
         if not objects_to_retime: return
-
-        snap_frames = wm.retimer_snap_frames # Cache property lookup
+        any_touched = False
+        failed_fcurves = 0 # Reported once per tick instead of once per F-Curve
+        scratch = self._scratch
 
         for obj_name in objects_to_retime:
+            # Looked up by name every tick: object references held across ticks can be invalid after undo
+            # (the modal passes Ctrl+Z through) or deletion, and touching them can crash Blender
             obj = bpy.data.objects.get(obj_name)
             if not obj or not obj.animation_data or not obj.animation_data.action: continue
-            if "objects_temp_keyframe_data" not in retimer_data or \
-               obj_name not in retimer_data["objects_temp_keyframe_data"]: continue
+            if obj_name not in retimer_data.objects_temp_keyframe_data: continue
 
             action = obj.animation_data.action
-            stored_fcurve_data = retimer_data["objects_temp_keyframe_data"][obj_name]
+            stored_fcurve_data = retimer_data.objects_temp_keyframe_data[obj_name]
 
             # --- OPTIMIZATION: Remove restore_from_original call here ---
-            # self.restore_from_original_for_object(obj) # REMOVED!
+            # restore_object_keyframes(obj) # REMOVED!
 
+            # F-Curves written this tick, update() (sort + handle recalculation) runs once per curve
+            # after all writes for the object are done
+            touched_fcurves = []
             for fcurve in action.fcurves:
                 key = (fcurve.data_path, fcurve.array_index)
                 if key not in stored_fcurve_data: continue
 
-                original_keys_for_fcurve = stored_fcurve_data[key]
-                if not original_keys_for_fcurve:
+                stored = stored_fcurve_data[key]
+                # Skip F-Curves whose keys all lie outside the affected range
+                if stored["x_max"] < affected_start or stored["x_min"] > affected_end: continue
+
+                co = stored["co"]
+                n = len(stored["interp"])
+                if n == 0:
                     # If original was empty, ensure current is also empty
                     if len(fcurve.keyframe_points) > 0:
                          try:
-                              while len(fcurve.keyframe_points) > 0:
-                                   fcurve.keyframe_points.remove(fcurve.keyframe_points[0], fast=True)
-                              fcurve.update()
+                              apply_keyframe_arrays(fcurve, co, stored["hl"], stored["hr"], stored["interp"], stored["type"], update=False)
+                              touched_fcurves.append(fcurve)
                          except ReferenceError: pass # Ignore if clearing fails
                     continue # Skip to next fcurve
 
-                # --- Calculate New X Positions ---
-                calculated_new_keys = [] # List of (new_x, y, interp, hl, hr, type)
-                for orig_x, orig_y, interp, hl, hr, k_type in original_keys_for_fcurve: # Unpack type
-                    segment_idx = find_segment(orig_x, original_segments)
-                    new_x = orig_x # Default
-
-                    if original_segments and current_segments: # Check lists aren't empty
-                        if segment_idx == 'before':
-                            offset = current_segments[0][0] - original_segments[0][0]
-                            new_x = orig_x + offset
-                        elif segment_idx == 'after':
-                            offset = current_segments[-1][1] - original_segments[-1][1]
-                            new_x = orig_x + offset
-                        elif isinstance(segment_idx, int):
-                            if 0 <= segment_idx < len(original_segments): # Bounds check
-                                orig_start, orig_end = original_segments[segment_idx]
-                                curr_start, curr_end = current_segments[segment_idx]
-                                orig_length = orig_end - orig_start
-
-                                if abs(orig_length) < 0.0001:
-                                    new_x = curr_start # Snap keys in zero-length segments to start
-                                else:
-                                    position_in_segment = (orig_x - orig_start) / float(orig_length)
-                                    curr_length = curr_end - curr_start
-                                    new_x = curr_start + (position_in_segment * curr_length)
-
-                    # Append calculated key including type
-                    calculated_new_keys.append((new_x, orig_y, interp, copy.deepcopy(hl), copy.deepcopy(hr), k_type))
+                # --- Calculate New X Positions (vectorized over all keys) ---
+                new_x_buf = scratch["x"][:n]
+                if stored["x_max"] < orig_starts[0]: # Entirely before the first marker: offset only, no segment math
+                    calculated_new_x = np.add(stored["x64"], curr_starts[0] - orig_starts[0], out=new_x_buf)
+                elif stored["x_min"] > orig_ends[-1]: # Entirely after the last marker
+                    calculated_new_x = np.add(stored["x64"], curr_ends[-1] - orig_ends[-1], out=new_x_buf)
+                elif uniform_scale:
+                    calculated_new_x = remap_frames_uniform(stored["x64"], orig_starts[0], orig_ends[-1], curr_starts[0], curr_ends[-1], out=new_x_buf)
+                elif HAVE_NUMBA:
+                    calculated_new_x = remap_frames_numba(stored["x64"], orig_starts, orig_ends, curr_starts, curr_ends, new_x_buf)
+                else:
+                    calculated_new_x = remap_frames(stored["x64"], orig_starts, orig_ends, curr_starts, curr_ends, orig_lengths, out=new_x_buf, tables=segment_tables)
 
 
                 # --- Apply Snapping and Merging (Handles Type) ---
-                final_keys_to_insert = {} # Use dict {frame: (x, y, interp, hl, hr, type)}
-
+                keep_in_order = False # Set when every key survives in its stored order
                 if snap_frames:
-                    temp_grouped_keys = defaultdict(list)
-                    # Group by rounded frame, store full calculated data
-                    for calc_x, y, interp, hl, hr, k_type in calculated_new_keys:
-                        rounded_x = round(calc_x)
-                        temp_grouped_keys[rounded_x].append((calc_x, y, interp, hl, hr, k_type))
-
-                    for frame, keys_at_frame in temp_grouped_keys.items():
-                        # Merge strategy: Keep the one whose calculated X was closest to the target frame
-                        keys_at_frame.sort(key=lambda k: abs(k[0] - frame))
-                        best_key_data = keys_at_frame[0]
-                        # Store using the rounded frame, but keep full data from the best key
-                        final_keys_to_insert[frame] = (frame, best_key_data[1], best_key_data[2], best_key_data[3], best_key_data[4], best_key_data[5]) # Include type
+                    rounded_x = np.rint(calculated_new_x, out=scratch["round"][:n])
+                    dist = np.subtract(calculated_new_x, rounded_x, out=scratch["dist"][:n])
+                    np.abs(dist, out=dist)
+                    # Merge strategy: per rounded frame keep the key whose calculated X was closest to it.
+                    # Sort by frame, then distance (lexsort is stable, so ties keep the earlier key),
+                    # and take the first key of every frame group.
+                    order = np.lexsort((dist, rounded_x))
+                    keep_x, first_idx = np.unique(rounded_x[order], return_index=True)
+                    keep = order[first_idx]
                 else:
-                     # No snapping, use calculated keys directly. Dict handles exact float duplicates.
-                     for calc_x, y, interp, hl, hr, k_type in calculated_new_keys:
-                          final_keys_to_insert[calc_x] = (calc_x, y, interp, hl, hr, k_type) # Include type
+                     # No snapping, use calculated keys directly. On exact float duplicates the later key wins.
+                     # The remap is monotonic while no marker has been dragged past its neighbour,
+                     # so the stored order is normally already sorted and only needs sorting as a fallback.
+                     diffs = np.subtract(calculated_new_x[1:], calculated_new_x[:-1], out=scratch["diff"][:n - 1])
+                     if np.all(diffs > 0):
+                          keep = scratch["identity"][:n]
+                          keep_in_order = True
+                          keep_x = calculated_new_x
+                     else:
+                          if np.all(diffs >= 0):
+                               order = np.arange(n)
+                               sorted_x = calculated_new_x
+                          else:
+                               order = np.argsort(calculated_new_x, kind='stable')
+                               sorted_x = calculated_new_x[order]
+                          # Keep the last key of every run of equal frames
+                          last_of_run = np.empty(n, dtype=bool)
+                          np.not_equal(sorted_x[1:], sorted_x[:-1], out=last_of_run[:-1])
+                          last_of_run[-1] = True
+                          keep = order[last_of_run]
+                          keep_x = sorted_x[last_of_run]
 
 
                 # --- 3c. Apply Updated Keyframes for this F-Curve ---
-                # Clear existing keyframes first
+                # Gather the surviving keys into the preallocated buffers for a single bulk write
+                m = len(keep)
+                new_co = scratch["co"][:m]
+                np.take(co, keep, axis=0, out=new_co)
+                new_co[:, 0] = keep_x
+
+                # Constant/linear-only curves never evaluate their handles, so leave them alone as long as
+                # the points are only moved in place. New points (count changed) still get proper handles.
+                if not stored["needs_handles"] and len(fcurve.keyframe_points) == m:
+                    new_hl = new_hr = None
+                else:
+                    new_hl = scratch["hl"][:m]
+                    new_hr = scratch["hr"][:m]
+                    dx = scratch["dx"][:m]
+                    np.take(stored["hl"], keep, axis=0, out=new_hl)
+                    np.take(stored["hr"], keep, axis=0, out=new_hr)
+                    # Handles travel with their key so non-auto handles keep their shape
+                    np.take(co[:, 0], keep, out=dx)
+                    np.subtract(new_co[:, 0], dx, out=dx)
+                    new_hl[:, 0] += dx
+                    new_hr[:, 0] += dx
+
+                # Interpolation and key type never change while retiming. If the points already hold
+                # every stored key in its original order, their enums are still correct, skip writing them.
+                in_order = keep_in_order or (len(keep) == n and bool(np.all(np.diff(keep) == 1)))
+                if in_order and stored["in_order"]:
+                    new_interp = new_type = None
+                else:
+                    new_interp, new_type = stored["interp"][keep], stored["type"][keep]
+
                 try:
-                    while len(fcurve.keyframe_points) > 0:
-                         fcurve.keyframe_points.remove(fcurve.keyframe_points[0], fast=True)
+                    apply_keyframe_arrays(fcurve, new_co, new_hl, new_hr, new_interp, new_type, update=False)
                 except ReferenceError:
-                     print(f"Warning: Could not clear keyframes for {key} in {obj_name} (during apply phase). Skipping update.")
-                     continue # Skip inserting if clearing failed
-
-
-                # Insert the final set of keys, sorted by frame
-                if not final_keys_to_insert:
-                     # Ensure fcurve is updated even if empty now
-                     fcurve.update()
+                     failed_fcurves += 1
+                     stored["in_order"] = False # Point state unknown, rewrite enums next time
                      continue
+                stored["in_order"] = in_order
+                touched_fcurves.append(fcurve)
 
-                final_sorted_keys = sorted(final_keys_to_insert.values(), key=lambda k: k[0])
-
-                # --- Batch insert? No direct batch insert with all properties ---
-                # --- Inserting one by one ---
-                for x, y, interp, hl, hr, k_type in final_sorted_keys: # Unpack type
-                    try:
-                        kp = fcurve.keyframe_points.insert(x, y, options={'NEEDED', 'FAST'})
-                        kp.interpolation = interp
-                        kp.handle_left = hl # Already deep copied
-                        kp.handle_right = hr # Already deep copied
-                        kp.type = k_type # Restore type
-                    except Exception as e:
-                        print(f"Error inserting final keyframe at {x} for {key} in {obj_name}: {e}")
-
-                fcurve.update() # Update fcurve after all points are inserted
+            for fcurve in touched_fcurves:
+                fcurve.update()
+            any_touched = any_touched or bool(touched_fcurves)
 
         # --- End of Object Loop ---
+        if failed_fcurves:
+            print(f"Warning: Could not resize keyframes on {failed_fcurves} F-Curve(s) (during apply phase). Skipped them.")
 
-        # Optional: Force UI redraw if needed, though fcurve.update() often suffices
-        # context.view_layer.update()
-        # for area in context.screen.areas:
-        #      if area.type == 'DOPESHEET_EDITOR':
-        #           area.tag_redraw()
+        # Single redraw for the whole tick, only when something actually changed
+        if any_touched and context.area:
+            context.area.tag_redraw()
 
         #perf_end_time = time.time()
         #print(f"Process Retiming took: {perf_end_time - perf_start_time:.4f} seconds") # Optional performance print
@@ -389,9 +649,25 @@ class ANIMATION_RETIMER_OT_RetimeMarker(bpy.types.Operator):
                  context.area.tag_redraw() # Update UI
                  self.report({'ERROR'}, "Error during update, retiming cancelled.")
                  return {'CANCELLED'}
+            self.update_timer_interval(context)
+        elif event.type in {'MOUSEMOVE', 'LEFTMOUSE'} and self._timer_interval != self._active_interval:
+            # User input while idle: a marker drag is likely about to start, so go back to the fast
+            # interval now instead of waiting for the slow timer to notice the first move
+            self._last_change_time = time.time()
+            self.update_timer_interval(context)
 
         return {'PASS_THROUGH'}
 
+    def update_timer_interval(self, context):
+        """Slow the modal timer down while markers are idle, speed it back up once one moves"""
+        idle = time.time() - self._last_change_time > self._idle_after
+        interval = self._idle_interval if idle else self._active_interval
+        if interval == self._timer_interval:
+            return
+        self.cancel_modal(context)
+        self._timer = context.window_manager.event_timer_add(interval, window=context.window)
+        self._timer_interval = interval
+
 
     def execute(self, context):
         wm = context.window_manager
@@ -415,21 +691,50 @@ class ANIMATION_RETIMER_OT_RetimeMarker(bpy.types.Operator):
                  return {'CANCELLED'}
 
             # Store original marker positions
-            retimer_data["original_markers"] = {m.name: m.frame for m in markers}
-            retimer_data["original_start"] = markers[0].frame
-            retimer_data["original_end"] = markers[-1].frame
-            retimer_data["original_segments"] = [
-                (markers[i].frame, markers[i+1].frame)
+            retimer_data.original_markers = {m.name: m.frame for m in markers}
+            retimer_data.original_start = markers[0].frame
+            retimer_data.original_end = markers[-1].frame
+            # Frozen for the whole session: an immutable tuple of int pairs can be shared and
+            # compared cheaply (identity first) by anything that caches on it
+            retimer_data.original_segments = tuple(
+                (int(markers[i].frame), int(markers[i+1].frame))
                 for i in range(len(markers)-1)
-            ]
+            )
+            # Panel status: (start, end, 1/length or 0.0 for zero-length segments), so draw() only multiplies
+            retimer_data.orig_seg_prepared = tuple(
+                (s, e, (1.0 / (e - s)) if abs(e - s) > 0.0001 else 0.0)
+                for s, e in retimer_data.original_segments
+            )
+
+            # One-time preprocessing: the original layout is fixed for the whole session,
+            # so sort it and build the segment arrays once (markers are already sorted by frame)
+            orig_frames = np.array([m.frame for m in markers], dtype=np.float64)
+            retimer_data.sorted_names = tuple(m.name for m in markers) # Invariant until Apply/Cancel, read by draw() too
+            retimer_data.orig_frames = orig_frames # Parallel to sorted_names
+            retimer_data.orig_starts = orig_frames[:-1]
+            retimer_data.orig_ends = orig_frames[1:]
+            retimer_data.orig_lengths = np.diff(orig_frames)
+            retimer_data.orig_has_ties = bool(np.any(retimer_data.orig_lengths == 0))
+
+            # Prime the segment cache with them
+            self._cached_marker_names = frozenset(retimer_data.original_markers)
+            self._cached_sorted_names = retimer_data.sorted_names
+            self._cached_orig_segments_np = (retimer_data.orig_starts, retimer_data.orig_ends, retimer_data.orig_lengths)
+            self._cached_orig_frames = orig_frames
+            self._cached_has_ties = retimer_data.orig_has_ties
+            if HAVE_NUMBA:
+                # Compile the kernel now (same argument types as the modal tick) so the first marker drag doesn't stall.
+                # Only the first call per Blender session compiles, later ones return immediately.
+                remap_frames_numba(orig_frames[:1].copy(), retimer_data.orig_starts, retimer_data.orig_ends,
+                                   retimer_data.orig_starts, retimer_data.orig_ends, np.empty(1, dtype=np.float64))
 
             # Store initial keyframes for selected objects
-            retimer_data["objects_temp_keyframe_data"] = {} # Clear/initialize
-            retimer_data["objects_processed"] = [] # Reset processed list
+            retimer_data.objects_temp_keyframe_data = {} # Clear/initialize
+            retimer_data.objects_processed = [] # Reset processed list
             success_count = 0
             for obj in selected_objects:
                 if self.store_initial_keyframe_data_for_object(obj):
-                    retimer_data["objects_processed"].append(obj.name)
+                    retimer_data.objects_processed.append(obj.name)
                     success_count += 1
 
             if success_count == 0:
@@ -437,15 +742,22 @@ class ANIMATION_RETIMER_OT_RetimeMarker(bpy.types.Operator):
                  retimer_data.clear() # Clear all data if failed
                  return {'CANCELLED'}
 
+            # One set of scratch buffers for the session, sized for the longest stored F-Curve
+            max_n = max((len(snapshot["interp"]) for fcurve_data in retimer_data.objects_temp_keyframe_data.values()
+                         for snapshot in fcurve_data.values()), default=0)
+            self._scratch = allocate_scratch_buffers(max_n)
+
             # Store current marker positions to detect changes
-            self._last_marker_positions = {m.name: m.frame for m in markers}
+            self._last_marker_fingerprint = get_marker_fingerprint(scene)
+            self._last_change_time = time.time()
 
             # Start modal timer (Increased interval for performance)
-            timer_interval = 0.1 # Seconds (10 updates per second)
+            timer_interval = self._active_interval # Seconds (10 updates per second), slowed down while idle
             self._timer = wm.event_timer_add(timer_interval, window=context.window)
+            self._timer_interval = timer_interval
             wm.modal_handler_add(self)
             wm.retimer_active = True
-            print(f"Retiming active for objects: {retimer_data['objects_processed']} (Update interval: {timer_interval}s)")
+            print(f"Retiming active for objects: {retimer_data.objects_processed} (Update interval: {timer_interval}s)")
             context.area.tag_redraw()
             return {'RUNNING_MODAL'}
         else:
@@ -465,6 +777,7 @@ class ANIMATION_RETIMER_OT_RetimeMarker(bpy.types.Operator):
                  # print("Modal timer already removed.") # Less verbose
                  pass
             self._timer = None
+        self._scratch = None # Release the session's scratch buffers
 
 
 class ANIMATION_RETIMER_OT_ApplyRetiming(bpy.types.Operator):
@@ -483,12 +796,9 @@ class ANIMATION_RETIMER_OT_ApplyRetiming(bpy.types.Operator):
         wm.retimer_active = False # Stop modal loop FIRST
 
         # Clear temporary data
-        retimer_data.pop("objects_temp_keyframe_data", None)
-        retimer_data.pop("objects_processed", None)
-        retimer_data.pop("original_markers", None)
-        retimer_data.pop("original_segments", None)
+        retimer_data.end_session()
 
-        context.area.tag_redraw()
+        redraw_marker_views(context)
         self.report({'INFO'}, "Retiming applied.")
         return {'FINISHED'}
 
@@ -502,10 +812,9 @@ class ANIMATION_RETIMER_OT_CancelRetiming(bpy.types.Operator):
         wm = context.window_manager
         scene = context.scene
 
-        objects_to_restore = retimer_data.get("objects_processed", [])
-        original_marker_positions = retimer_data.get("original_markers", {})
-        stored_keyframe_data_exists = "objects_temp_keyframe_data" in retimer_data and \
-                                     retimer_data["objects_temp_keyframe_data"]
+        objects_to_restore = retimer_data.objects_processed
+        original_marker_positions = retimer_data.original_markers
+        stored_keyframe_data_exists = bool(retimer_data.objects_temp_keyframe_data)
 
         if not objects_to_restore and not original_marker_positions and not stored_keyframe_data_exists:
              self.report({'WARNING'}, "No retiming data found to cancel/discard.")
@@ -520,19 +829,18 @@ class ANIMATION_RETIMER_OT_CancelRetiming(bpy.types.Operator):
         # --- Restore Keyframes (using the dedicated restore function now) ---
         if stored_keyframe_data_exists:
             # print(f"Objects to restore keyframes for: {objects_to_restore}") # Less verbose
-            # Need an instance of the RetimeMarker operator to call its restore method? No, moved logic.
-            # Create temporary instance? No, call directly if possible.
-            # Let's reuse the restore method logic directly here or call it if accessible.
-            # Calling requires an instance... let's reuse the logic for safety.
-
-            restore_instance = ANIMATION_RETIMER_OT_RetimeMarker() # Temporary instance ok? Seems ok.
+            # Module-level restore reading the same snapshot store as the modal operator, no operator instance needed
+            failed_fcurves = 0
+            missing_objects = 0
             for obj_name in objects_to_restore:
                 obj = bpy.data.objects.get(obj_name)
                 if obj:
-                    # Use the restore method from the class
-                    restore_instance.restore_from_original_for_object(obj)
+                    failed_fcurves += restore_object_keyframes(obj)
                 else:
-                    print(f"Skipping restore for missing object: {obj_name}")
+                    missing_objects += 1
+            # One aggregated warning instead of console output per object / F-Curve
+            if failed_fcurves or missing_objects:
+                self.report({'WARNING'}, f"Could not restore {failed_fcurves} F-Curve(s); {missing_objects} object(s) missing.")
         # else: print("No stored keyframe data to restore.") # Less verbose
 
 
@@ -541,34 +849,32 @@ class ANIMATION_RETIMER_OT_CancelRetiming(bpy.types.Operator):
             # print("Restoring marker positions...") # Less verbose
             if scene and scene.timeline_markers: # Check scene and markers exist
                 current_markers = scene.timeline_markers
-                markers_to_remove = []
+                names_to_remove = [] # Names only, so no reference can dangle once removals start
                 processed_marker_names = set()
 
                 for name, frame in original_marker_positions.items():
-                    if name in current_markers:
-                        current_markers[name].frame = frame
+                    marker = current_markers.get(name)
+                    if marker is not None:
+                        marker.frame = frame
                         processed_marker_names.add(name)
                     # else: print(f"  Original marker {name} not found, cannot restore.") # Less verbose
 
                 for marker in current_markers:
                      if marker.name.startswith("RT_") and marker.name not in processed_marker_names:
-                          markers_to_remove.append(marker)
+                          names_to_remove.append(marker.name)
                           # print(f"  Removing marker potentially added during retiming: {marker.name}") # Less verbose
 
-                for marker in markers_to_remove:
-                     try: current_markers.remove(marker)
-                     except (KeyError, ReferenceError): pass # Ignore if already gone
+                for name in names_to_remove:
+                     marker = current_markers.get(name)
+                     if marker is not None: current_markers.remove(marker)
 
         # else: print("No original marker positions stored to restore.") # Less verbose
 
 
         # --- Clean up global data ---
-        retimer_data.pop("objects_temp_keyframe_data", None)
-        retimer_data.pop("objects_processed", None)
-        retimer_data.pop("original_markers", None)
-        retimer_data.pop("original_segments", None)
+        retimer_data.end_session()
 
-        context.area.tag_redraw()
+        redraw_marker_views(context)
         self.report({'INFO'}, "Retiming cancelled, changes discarded.")
         return {'FINISHED'}
 
@@ -596,10 +902,12 @@ class ANIMATION_RETIMER_OT_DeleteMarker(bpy.types.Operator):
              return {'CANCELLED'}
 
         markers = context.scene.timeline_markers
-        if self.marker_name in markers:
+        marker = markers.get(self.marker_name)
+        if marker is not None:
             try:
-                markers.remove(markers[self.marker_name])
-                retimer_data.get("original_markers", {}).pop(self.marker_name, None)
+                markers.remove(marker)
+                retimer_data.original_markers.pop(self.marker_name, None)
+                redraw_marker_views(context)
                 # self.report({'INFO'}, f"Deleted marker: {self.marker_name}") # Less verbose
             except (KeyError, ReferenceError):
                  self.report({'WARNING'}, f"Marker '{self.marker_name}' could not be removed.")
@@ -628,17 +936,22 @@ class ANIMATION_RETIMER_OT_ClearMarkers(bpy.types.Operator):
              return {'CANCELLED'}
 
         markers = context.scene.timeline_markers
-        to_remove = [m for m in markers if m.name.startswith("RT_")]
-        if not to_remove:
+        # Collect names only, so no reference can dangle once removals start
+        names_to_remove = tuple(m.name for m in markers if m.name.startswith("RT_"))
+        if not names_to_remove:
              self.report({'INFO'}, "No 'RT_' markers found to clear.")
              return {'CANCELLED'}
 
-        count = len(to_remove)
-        for marker in to_remove:
-            try: markers.remove(marker)
-            except (KeyError, ReferenceError): pass
+        # Drop cached state first so redraws during the removal don't rebuild it from stale markers
+        retimer_data.original_markers = {}
+        retimer_data.sorted_names = ()
 
-        retimer_data.pop("original_markers", None)
+        count = len(names_to_remove)
+        for name in names_to_remove:
+            marker = markers.get(name)
+            if marker is not None: markers.remove(marker)
+
+        redraw_marker_views(context)
         self.report({'INFO'}, f"Cleared {count} 'RT_' markers.")
         return {'FINISHED'}
 
@@ -656,17 +969,15 @@ class ANIMATION_RETIMER_OT_SelectMarker(bpy.types.Operator):
              self.report({'ERROR'}, "No scene or timeline markers found.")
              return {'CANCELLED'}
         scene = context.scene
-        markers = scene.timeline_markers
-        if self.marker_name in markers:
-            marker = markers[self.marker_name]
-            try:
-                 scene.frame_set(marker.frame)
-            except Exception as e:
-                 self.report({'ERROR'}, f"Could not set frame: {e}")
-                 return {'CANCELLED'}
-        else:
+        marker = scene.timeline_markers.get(self.marker_name) # Single lookup instead of `in` + indexing
+        if marker is None:
              self.report({'WARNING'}, f"Marker '{self.marker_name}' not found.")
              return {'CANCELLED'}
+        try:
+             scene.frame_set(marker.frame)
+        except Exception as e:
+             self.report({'ERROR'}, f"Could not set frame: {e}")
+             return {'CANCELLED'}
         return {'FINISHED'}
 
 # --- Panel ---
@@ -685,6 +996,8 @@ class ANIMATION_RETIMER_PT_Panel(bpy.types.Panel):
         if not scene: # Handle case where scene might not be available
              layout.label(text="No active scene.", icon='ERROR')
              return
+        # Computed once per redraw and only iterated below. Skipped when no section lists the markers.
+        ordered_markers = get_ordered_markers(scene) if wm.retimer_active or wm.show_retime_markers else ()
 
         # --- Main Controls ---
         col = layout.column(align=True)
@@ -693,16 +1006,18 @@ class ANIMATION_RETIMER_PT_Panel(bpy.types.Panel):
             row.operator("animation_retimer.apply_retiming", text="Apply Changes", icon='CHECKMARK')
             row.operator("animation_retimer.cancel_retiming", text="Discard Changes", icon='X')
             col.label(text="Retiming Active...", icon='INFO')
-            processed_objs = retimer_data.get("objects_processed", [])
-            if processed_objs:
+            processed_objs = retimer_data.objects_processed
+            n_processed = len(processed_objs) if processed_objs else 0
+            if n_processed:
                  box = col.box()
-                 box.label(text=f"Processing ({len(processed_objs)}):")
+                 box.label(text=f"Processing ({n_processed}):")
                  limit = 3
-                 for i, name in enumerate(processed_objs):
-                      if i >= limit: box.label(text=f"...and {len(processed_objs) - limit} more"); break
+                 for name in processed_objs[:limit]: # Bounded work, however many objects are retimed
                       box.label(text=f"- {name}", icon='OBJECT_DATA')
+                 if n_processed > limit: box.label(text=f"...and {n_processed - limit} more")
         else:
-            can_start = len(get_ordered_markers(scene)) >= 2
+            # Reuse the list when it was built above, otherwise count without sorting: one name scan per redraw either way
+            can_start = (len(ordered_markers) if wm.show_retime_markers else rt_marker_count(scene)) >= 2
             row = col.row()
             row.enabled = can_start
             row.operator("animation_retimer.retime_marker", text="Start Retiming", icon='PLAY')
@@ -723,55 +1038,65 @@ class ANIMATION_RETIMER_PT_Panel(bpy.types.Panel):
 
         # --- Segments Info (when active) ---
         if wm.retimer_active:
-            markers = get_ordered_markers(scene)
+            markers = ordered_markers
             if len(markers) >= 2:
                 layout.separator()
                 box = layout.box()
                 box.label(text="Segment Status:", icon='NLA')
-                original_segments_ui = retimer_data.get("original_segments", [])
-                original_markers_map = retimer_data.get("original_markers",{})
+                original_segments_ui = retimer_data.original_segments
+                original_markers_map = retimer_data.original_markers
                 if not original_markers_map or not original_segments_ui:
                      box.label(text="Original data missing.", icon='ERROR')
                      return # Exit draw section if data is bad
 
-                valid_current_markers = {name: m for name, m in zip(original_markers_map.keys(), markers) if name in original_markers_map}
-                sorted_marker_names = sorted(valid_current_markers.keys(), key=lambda name: original_markers_map[name])
-
-                current_segments_ui = []
-                valid_segment_count = 0
-                for i in range(len(sorted_marker_names) - 1):
-                     name1, name2 = sorted_marker_names[i], sorted_marker_names[i+1]
-                     frame1 = scene.timeline_markers.get(name1)
-                     frame2 = scene.timeline_markers.get(name2)
-                     if frame1 is not None and frame2 is not None:
-                          current_segments_ui.append((frame1.frame, frame2.frame))
-                          valid_segment_count += 1
-                     else:
-                          current_segments_ui.append(None) # Placeholder
-
-                if valid_segment_count == len(original_segments_ui):
-                    has_collapsed = False
-                    for i, current_seg in enumerate(current_segments_ui):
-                        if current_seg is None: continue # Skip already handled missing markers
-                        row = box.row()
-                        curr_start, curr_end = current_seg
-                        orig_start, orig_end = original_segments_ui[i]
-                        orig_length = orig_end - orig_start
-                        curr_length = curr_end - curr_start
-                        icon = 'RIGHTARROW' # Default icon
-                        if curr_start > curr_end:
-                            speed_text = "Collapsed/Inverted"; icon = 'ERROR'; has_collapsed = True
-                        elif abs(orig_length) < 0.0001:
-                            speed_text = "From Zero Length"; icon='INFO'
-                        else:
-                            ratio = curr_length / float(orig_length)
-                            speed_text = f"{ratio:.2f}x Speed"
-                            if ratio > 1: icon = 'TRIA_DOWN'
-                            elif ratio < 1: icon = 'TRIA_UP'
-                        row.label(text=f"Seg {i+1} [{orig_start}-{orig_end} -> {curr_start}-{curr_end}]: {speed_text}", icon=icon)
-                    if has_collapsed: box.label(text="Collapsed segments!", icon='ERROR')
-                else:
-                     box.label(text="Segment mismatch (Markers missing?)", icon='QUESTION')
+                # Reuse the rendered rows while no marker moved: draw() runs on every mouse move over the panel
+                seg_key = (original_segments_ui, tuple((m.name, m.frame) for m in markers))
+                seg_cache = retimer_data.seg_ui_cache
+                if seg_cache is None or seg_cache["key"] != seg_key:
+                    rows, footer = [], None # rows: [(text, icon)] one per segment, footer: (text, icon) or None
+
+                    # Original names were sorted by frame once at retime start, look each one up exactly once
+                    sorted_marker_names = retimer_data.sorted_names
+                    tm_get = scene.timeline_markers.get
+                    current = [tm_get(name) for name in sorted_marker_names]
+                    if retimer_data.orig_has_ties and None not in current:
+                        # Same order as process_retiming uses for markers that started on the same frame
+                        perm = order_tied_markers(retimer_data.orig_frames, [m.frame for m in current])
+                        current = [current[i] for i in perm]
+
+                    current_segments_ui = []
+                    all_valid = True
+                    for marker1, marker2 in zip(current, current[1:]):
+                         if marker1 is None or marker2 is None:
+                              all_valid = False; break # A marker went missing, nothing to show per segment
+                         current_segments_ui.append((marker1.frame, marker2.frame))
+
+                    prepared_segments = retimer_data.orig_seg_prepared
+                    if all_valid and len(current_segments_ui) == len(prepared_segments):
+                        has_collapsed = False
+                        for i, (curr_start, curr_end) in enumerate(current_segments_ui):
+                            orig_start, orig_end, inv_orig_length = prepared_segments[i]
+                            curr_length = curr_end - curr_start
+                            if curr_start > curr_end:
+                                speed_text = "Collapsed/Inverted"; icon = 'ERROR'; has_collapsed = True
+                            elif inv_orig_length == 0.0:
+                                speed_text = "From Zero Length"; icon='INFO'
+                            else:
+                                ratio = curr_length * inv_orig_length
+                                speed_text = f"{ratio:.2f}x Speed"
+                                # Compare the integer lengths: curr * (1/orig) can be off by an ulp from 1.0 for equal lengths
+                                orig_length = orig_end - orig_start
+                                icon = _SPEED_ICON[(curr_length > orig_length) - (curr_length < orig_length)]
+                            rows.append((_SEG_FMT.format_map({"i": i+1, "os": orig_start, "oe": orig_end, "cs": curr_start, "ce": curr_end, "txt": speed_text}), icon))
+                        if has_collapsed: footer = ("Collapsed segments!", 'ERROR')
+                    else:
+                         footer = ("Segment mismatch (Markers missing?)", 'QUESTION')
+                    seg_cache = retimer_data.seg_ui_cache = {"key": seg_key, "rows": rows, "footer": footer}
+
+                for text, icon in seg_cache["rows"]:
+                    box.row().label(text=text, icon=icon)
+                if seg_cache["footer"]:
+                    box.label(text=seg_cache["footer"][0], icon=seg_cache["footer"][1])
 
 
         # --- Marker Details List ---
@@ -781,21 +1106,26 @@ class ANIMATION_RETIMER_PT_Panel(bpy.types.Panel):
 
         if wm.show_retime_markers:
             box = layout.box()
-            markers = get_ordered_markers(scene)
+            markers = ordered_markers
             if not markers: box.label(text="No 'RT_' markers found.", icon='INFO')
             else:
+                # Hoisted out of the loop, one row is built per marker on every redraw
+                props_editable = not wm.retimer_active
+                op_select = "animation_retimer.select_marker"
+                op_delete = "animation_retimer.delete_marker"
                 for marker in markers:
+                    name = marker.name # Read once, used by both buttons and the label
                     row = box.row(align=True); row.scale_y = 0.9
                     # Jump Button
-                    op_jump = row.operator("animation_retimer.select_marker", text="", icon='RESTRICT_SELECT_OFF')
-                    op_jump.marker_name = marker.name
+                    op_jump = row.operator(op_select, text="", icon='RESTRICT_SELECT_OFF')
+                    op_jump.marker_name = name
                     # Name/Frame Property (disable editing during retime)
                     row_prop = row.row() # Sub-row to disable only the prop
-                    row_prop.enabled = not wm.retimer_active
-                    row_prop.prop(marker, "frame", text=marker.name)
+                    row_prop.enabled = props_editable
+                    row_prop.prop(marker, "frame", text=name)
                     # Delete Button (disabled via poll)
-                    op_del = row.operator("animation_retimer.delete_marker", text="", icon='X', emboss=False)
-                    op_del.marker_name = marker.name
+                    op_del = row.operator(op_delete, text="", icon='X', emboss=False)
+                    op_del.marker_name = name
 
 
 # --- Registration ---
@@ -811,10 +1141,17 @@ classes = (
     ANIMATION_RETIMER_PT_Panel,
 )
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
+# What this module has installed, so (un)registering twice is a no-op instead of an exception
+_registered = False # Whether the classes are currently registered
+_installed_props = set()
+
 def register():
-    for cls in classes:
-        try: bpy.utils.register_class(cls)
-        except ValueError: pass # Already registered
+    global _registered
+    if not _registered:
+        _register_classes()
+        _registered = True
 
     props = {
         "retimer_active": bpy.props.BoolProperty(name="Retimer Active", default=False),
@@ -822,25 +1159,25 @@ def register():
         "show_retime_markers": bpy.props.BoolProperty(name="Show Markers List", default=True)
     }
     for name, prop in props.items():
-         if not hasattr(bpy.types.WindowManager, name):
+         if name not in _installed_props:
               setattr(bpy.types.WindowManager, name, prop)
+              _installed_props.add(name)
 
     print("Animation Retimer (Multi-Object) Registered")
 
 
 def unregister():
+    global _registered
     print("Unregistering Animation Retimer (Multi-Object)...")
     retimer_data.clear() # Clear data on unregister
 
-    for cls in reversed(classes):
-        try: bpy.utils.unregister_class(cls)
-        except RuntimeError: pass # Not registered
+    if _registered:
+        _unregister_classes() # Reverse order, handled by the factory
+        _registered = False
 
-    props_to_delete = ["retimer_active", "retimer_snap_frames", "show_retime_markers"]
-    for prop in props_to_delete:
-        if hasattr(bpy.types.WindowManager, prop):
-            try: delattr(bpy.types.WindowManager, prop)
-            except Exception: pass
+    for prop in tuple(_installed_props):
+        delattr(bpy.types.WindowManager, prop)
+        _installed_props.discard(prop)
 
     print("Animation Retimer (Multi-Object) Unregistered")
 